@@ -157,9 +157,30 @@ class FilterCache:
             rows: 過濾結果行號列表
             scan_stats: 掃描統計信息
         """
+        cache_key = self._put_entry(excel_file, f_value, g_value, h_value, rows, scan_stats)
+        self._save_cache()
+        
+        logger.info(f"緩存保存成功: {cache_key}, {len(rows)} 行結果")
+    
+    def save_many(self, items: List[Tuple]):
+        """
+        批量保存過濾結果到緩存，所有條目更新後只寫入一次緩存文件
+        
+        Args:
+            items: (excel_file, f_value, g_value, h_value, rows[, scan_stats]) 元組列表
+        """
+        for item in items:
+            self._put_entry(*item)
+        self._save_cache()
+        
+        logger.info(f"批量緩存保存成功: {len(items)} 條記錄")
+    
+    def _put_entry(self, excel_file: str, f_value: str, g_value: str, h_value: str,
+                   rows: List[int], scan_stats: Dict = None) -> str:
+        """構建緩存條目並放入內存緩存（不寫入文件），返回緩存鍵"""
         cache_key = self._generate_cache_key(excel_file, f_value, g_value, h_value)
         
-        cache_entry = {
+        self.cache_data[cache_key] = {
             'excel_file': os.path.basename(excel_file),
             'f_value': f_value,
             'g_value': g_value,
@@ -168,11 +189,7 @@ class FilterCache:
             'cache_time': datetime.now().isoformat(),
             'scan_stats': scan_stats or {}
         }
-        
-        self.cache_data[cache_key] = cache_entry
-        self._save_cache()
-        
-        logger.info(f"緩存保存成功: {cache_key}, {len(rows)} 行結果")
+        return cache_key
     
     def get_cache_stats(self) -> Dict:
         """獲取緩存統計信息"""
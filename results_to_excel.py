@@ -8,13 +8,19 @@
 import json
 import openpyxl
 from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.cell.cell import KNOWN_TYPES
 import configparser
 import logging
 from datetime import datetime
 import os
+import io
 import argparse
 import glob
-from typing import Dict, Any, List
+import operator
+import functools
+from collections import defaultdict
+from typing import Dict, Any, List, NamedTuple, Optional
 from copy import copy
 try:
     from tqdm import tqdm
@@ -22,6 +28,21 @@ try:
 except ImportError:
     TQDM_AVAILABLE = False
     print("警告: tqdm库未安装，将使用简单进度显示。建议安装: pip install tqdm")
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+try:
+    import xlsxwriter
+    XLSXWRITER_AVAILABLE = True
+except ImportError:
+    XLSXWRITER_AVAILABLE = False
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 # 設置日誌
 logging.basicConfig(
@@ -30,14 +51,349 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 輸出只涉及少量固定列，緩存列號到列字母的轉換
+_get_col_letter = functools.lru_cache(maxsize=64)(get_column_letter)
+
+# 無tqdm時每處理多少條記錄才輸出一次文字進度，減少終端輸出開銷
+PROGRESS_UPDATE_EVERY = 256
+
+# 大模型回應無法解析時結果中的佔位值
+_PARSE_FAIL = '解析失敗'
+
+# 合併到綜合評論欄位的評論（標籤, 結果鍵），按輸出順序排列
+_COMMENT_FIELDS = (
+    ("廣度評論", "breadth_comment"),
+    ("深度評論", "depth_comment"),
+    ("獨特性評論", "uniqueness_comment"),
+)
+
+class RowPayload(NamedTuple):
+    """單行待寫入的內容（不含openpyxl對象），None表示不寫入"""
+    breadth_score: Any
+    depth_score: Any
+    uniqueness_score: Any
+    overall_score: Any
+    combined_comment: Optional[str]
+    overall_comment: Any
+    question_comment: Optional[str]
+    answer_comment: Optional[str]
+
+def _valid_value(result: Dict[str, Any], key: str) -> Any:
+    """取得結果值，解析失敗或為空字符串時返回None（不寫入，單元格保持默認樣式）"""
+    value = result.get(key)
+    return None if value == _PARSE_FAIL or value == '' else value
+
+def _summary_comment(summary: Any) -> Optional[str]:
+    """構建摘要comment文本，摘要為空白時返回None（不創建comment）"""
+    if summary is None or not str(summary).strip():
+        return None
+    return f"大模型摘要: {summary}"
+
+def _combine_comments(result: Dict[str, Any]) -> Optional[str]:
+    """合併廣度、深度、獨特性評論到一個欄位"""
+    comments = []
+    for label, key in _COMMENT_FIELDS:
+        comment = result.get(key)
+        if comment and comment != _PARSE_FAIL:
+            comments.append(f"【{label}】\n{comment}")
+    
+    # 用雙換行分隔不同類型的評論
+    return '\n\n'.join(comments) if comments else None
+
+def build_row_payload(result: Dict[str, Any]) -> RowPayload:
+    """根據單條精選評分結果構建待寫入的行內容（純函數）"""
+    return RowPayload(
+        breadth_score=_valid_value(result, 'breadth_score'),
+        depth_score=_valid_value(result, 'depth_score'),
+        uniqueness_score=_valid_value(result, 'uniqueness_score'),
+        overall_score=_valid_value(result, 'overall_score'),
+        combined_comment=_combine_comments(result),
+        overall_comment=_valid_value(result, 'overall_comment'),
+        question_comment=_summary_comment(_valid_value(result, 'question_summary')),
+        answer_comment=_summary_comment(_valid_value(result, 'answer_summary'))
+    )
+
+class _StreamingCell:
+    """緩衝寫入器的單元格，只記錄值、樣式和comment"""
+    
+    __slots__ = ('_value', 'font', 'alignment', 'border', 'fill', 'number_format', 'protection', 'comment')
+    
+    def __init__(self):
+        self._value = None
+        self.font = None
+        self.alignment = None
+        self.border = None
+        self.fill = None
+        self.number_format = None
+        self.protection = None
+        self.comment = None
+    
+    @property
+    def value(self) -> Any:
+        return self._value
+    
+    @value.setter
+    def value(self, value: Any):
+        # 與openpyxl的Cell一致，賦值時就拒絕無法寫入Excel的類型（如list、dict），
+        # 否則錯誤要到保存時才出現，導致整個文件無法輸出
+        if not isinstance(value, KNOWN_TYPES):
+            raise ValueError(f"Cannot convert {value!r} to Excel")
+        self._value = value
+
+class _StreamingColumn:
+    """緩衝寫入器的列設置"""
+    
+    __slots__ = ('width',)
+    
+    def __init__(self):
+        self.width = None
+
+class _StreamingWriter:
+    """
+    精簡模式（及流式完整模式）的緩衝寫入器（同時充當工作簿和工作表）
+    
+    提供本程序用到的openpyxl接口（cell、column_dimensions、max_row、save）和只產出值的iter_rows，
+    寫入內容先緩衝為輕量記錄，保存時一次性按行順序流式輸出：
+    backend為'xlsxwriter'時交給xlsxwriter，為'openpyxl'時使用openpyxl的write_only模式，
+    兩者都不在內存中構建完整的openpyxl工作表。
+    填充、數字格式和保護只有openpyxl後端會輸出（復制源文件格式時使用）。
+    """
+    
+    # openpyxl與xlsxwriter垂直對齊取值的差異
+    _VALIGN_MAP = {'center': 'vcenter'}
+    
+    def __init__(self, title: str, backend: str = 'xlsxwriter'):
+        self.title = title
+        self.backend = backend
+        self.column_dimensions = defaultdict(_StreamingColumn)
+        self.max_row = 0
+        self._cells = {}
+    
+    def cell(self, row: int, column: int, value: Any = None) -> _StreamingCell:
+        """獲取（必要時創建）緩衝單元格，與openpyxl的Worksheet.cell用法一致"""
+        cell = self._cells.get((row, column))
+        if cell is None:
+            cell = self._cells[(row, column)] = _StreamingCell()
+            if row > self.max_row:
+                self.max_row = row
+        if value is not None:
+            cell.value = value
+        return cell
+    
+    def iter_rows(self, min_row: int = 1, max_row: Optional[int] = None,
+                  min_col: int = 1, max_col: Optional[int] = None):
+        """按行產出緩衝單元格的值（相當於openpyxl的values_only=True，供列寬計算使用）"""
+        if max_row is None:
+            max_row = self.max_row
+        if max_col is None:
+            max_col = max((col for _, col in self._cells), default=0)
+        
+        cells = self._cells
+        cols = range(min_col, max_col + 1)
+        for row in range(min_row, max_row + 1):
+            values = []
+            for col in cols:
+                cell = cells.get((row, col))
+                values.append(cell.value if cell is not None else None)
+            yield tuple(values)
+    
+    def save(self, output_file):
+        """輸出所有緩衝內容（output_file可為文件路徑或BytesIO）"""
+        if self.backend == 'openpyxl':
+            self._save_openpyxl(output_file)
+        else:
+            self._save_xlsxwriter(output_file)
+    
+    def _save_openpyxl(self, output_file):
+        """使用openpyxl的write_only模式按行順序追加輸出"""
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(self.title)
+        
+        # write_only模式下列寬必須在追加行之前設置
+        for letter, dimension in self.column_dimensions.items():
+            if dimension.width is not None:
+                worksheet.column_dimensions[letter].width = dimension.width
+        
+        # 相同樣式組合只完整賦值一次，之後複製樣式索引數組
+        style_cache = {}
+        
+        # write_only模式只能按行順序追加，先按行分組
+        rows = defaultdict(dict)
+        for (row, col), cell in self._cells.items():
+            rows[row][col] = cell
+        
+        for row in range(1, self.max_row + 1):
+            row_cells = rows.get(row)
+            if not row_cells:
+                worksheet.append([])
+                continue
+            
+            # openpyxl追加時會把帶comment但無樣式的單元格對象復用於後續的純值，
+            # 導致comment被帶到後面的單元格，因此含comment的行全部使用WriteOnlyCell
+            has_comment = any(cell.comment is not None for cell in row_cells.values())
+            
+            row_values = [None] * max(row_cells)
+            for col, cell in row_cells.items():
+                styles = (cell.font, cell.alignment, cell.border, cell.fill, cell.number_format, cell.protection)
+                has_style = any(style is not None for style in styles)
+                if not has_comment and not has_style:
+                    # 無格式的單元格直接追加值
+                    row_values[col - 1] = cell.value
+                    continue
+                
+                target_cell = WriteOnlyCell(worksheet, value=cell.value)
+                if has_style:
+                    style_key = tuple(map(id, styles))
+                    cached_style = style_cache.get(style_key)
+                    if cached_style is not None:
+                        target_cell._style = copy(cached_style)
+                    else:
+                        font, alignment, border, fill, number_format, protection = styles
+                        if font is not None:
+                            target_cell.font = font
+                        if alignment is not None:
+                            target_cell.alignment = alignment
+                        if border is not None:
+                            target_cell.border = border
+                        if fill is not None:
+                            target_cell.fill = fill
+                        if number_format is not None:
+                            target_cell.number_format = number_format
+                        if protection is not None:
+                            target_cell.protection = protection
+                        style_cache[style_key] = target_cell._style
+                if cell.comment is not None:
+                    target_cell.comment = cell.comment
+                row_values[col - 1] = target_cell
+            
+            worksheet.append(row_values)
+        
+        workbook.save(output_file)
+    
+    def _save_xlsxwriter(self, output_file):
+        """使用xlsxwriter輸出"""
+        workbook = xlsxwriter.Workbook(output_file, {
+            'in_memory': True,
+            'strings_to_urls': False,
+            'strings_to_formulas': False,
+            'default_date_format': 'yyyy-mm-dd'
+        })
+        worksheet = workbook.add_worksheet(self.title)
+        
+        for letter, dimension in self.column_dimensions.items():
+            if dimension.width is not None:
+                worksheet.set_column(f"{letter}:{letter}", dimension.width)
+        
+        # 相同樣式組合只創建一個Format對象
+        formats = {}
+        for (row, col), cell in self._cells.items():
+            cell_format = None
+            props = self._format_props(cell)
+            if props:
+                cell_format = formats.get(props)
+                if cell_format is None:
+                    cell_format = formats[props] = workbook.add_format(dict(props))
+            
+            if cell.value is not None:
+                worksheet.write(row - 1, col - 1, cell.value, cell_format)
+            elif cell_format is not None:
+                worksheet.write_blank(row - 1, col - 1, None, cell_format)
+            
+            if cell.comment is not None:
+                worksheet.write_comment(row - 1, col - 1, cell.comment.text, {
+                    'author': cell.comment.author,
+                    'width': cell.comment.width,
+                    'height': cell.comment.height
+                })
+        
+        workbook.close()
+    
+    @classmethod
+    def _format_props(cls, cell: _StreamingCell) -> tuple:
+        """將單元格上的openpyxl樣式轉換為xlsxwriter格式屬性（可哈希，用於緩存Format）"""
+        props = []
+        
+        if cell.font is not None and cell.font.b:
+            props.append(('bold', True))
+        
+        alignment = cell.alignment
+        if alignment is not None:
+            if alignment.wrap_text:
+                props.append(('text_wrap', True))
+            if alignment.horizontal:
+                props.append(('align', alignment.horizontal))
+            if alignment.vertical:
+                props.append(('valign', cls._VALIGN_MAP.get(alignment.vertical, alignment.vertical)))
+        
+        border = cell.border
+        if border is not None:
+            for side in ('left', 'right', 'top', 'bottom'):
+                if getattr(border, side).style == 'thin':
+                    props.append((side, 1))
+        
+        return tuple(props)
+
+def _iter_row_values(worksheet, min_row: int, max_row: int, min_col: int, max_col: int):
+    """按行產出指定範圍內單元格的值，同時支持openpyxl工作表和緩衝寫入器"""
+    if isinstance(worksheet, _StreamingWriter):
+        return worksheet.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col)
+    return worksheet.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col,
+                               values_only=True)
+
 class CurationResultsWriter:
     """精選評分結果寫入Excel"""
     
     def __init__(self, config_file: str = 'config.ini'):
-        """初始化"""
+        """
+        初始化
+        
+        Args:
+            config_file: 配置文件路徑
+        """
         self.config = configparser.ConfigParser()
         self.config.read(config_file, encoding='utf-8')
         
+        # 預先讀取輸出列配置，避免在逐行寫入時反覆解析配置
+        self._sheet_name = self.config.get('excel', 'sheet_name')
+        self._question_col = self.config.getint('excel', 'question_column')
+        self._answer_col = self.config.getint('excel', 'answer_column')
+        self._breadth_score_col = self.config.getint('output', 'breadth_score_column')
+        self._depth_score_col = self.config.getint('output', 'depth_score_column')
+        self._uniqueness_score_col = self.config.getint('output', 'uniqueness_score_column')
+        self._overall_score_col = self.config.getint('output', 'overall_score_column')
+        self._combined_comment_col = self.config.getint('output', 'combined_comment_column')
+        self._overall_comment_col = self.config.getint('output', 'overall_comment_column')
+        
+        self._output_mode = self.config.get('excel_output', 'output_mode', fallback='compact')
+        
+        # 精簡模式的寫入後端：auto（自動選擇）、xlsxwriter、openpyxl
+        self._writer_backend = self.config.get('excel_output', 'writer_backend', fallback='auto').strip().lower()
+        
+        # 完整模式是否流式處理，以及流式處理時是否復制源單元格格式
+        self._stream_full_mode = self.config.getboolean('excel_output', 'stream_full_mode', fallback=False)
+        self._preserve_formatting = self.config.getboolean('excel_output', 'preserve_formatting', fallback=True)
+        
+        # 精簡模式是否復制源單元格格式，默認只復制值，並可改用xlsxwriter寫入
+        self._preserve_styles = self.config.getboolean('excel_output', 'preserve_styles', fallback=False)
+        
+        # 共享的單元格樣式對象：openpyxl樣式在賦值後不可變，同一實例可安全賦給多個單元格
+        self._thin_side = openpyxl.styles.Side(style='thin')
+        self._thin_border = openpyxl.styles.Border(
+            left=self._thin_side,
+            right=self._thin_side,
+            top=self._thin_side,
+            bottom=self._thin_side
+        )
+        self._body_align = openpyxl.styles.Alignment(
+            wrap_text=True,
+            vertical='top',
+            horizontal='left'
+        )
+        self._wrap_alignment = openpyxl.styles.Alignment(wrap_text=True, vertical='top')
+        
         logger.info("Excel寫入器初始化完成")
     
     def find_json_files(self, input_path: str) -> List[str]:
@@ -95,8 +451,8 @@ class CurationResultsWriter:
             try:
                 logger.info(f"處理文件 {i+1}/{len(json_files)}: {os.path.basename(json_file)}")
                 
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(json_file, 'rb') as f:
+                    data = _json_loads(f.read())
                 
                 # 處理批次文件格式
                 if 'results' in data:
@@ -173,8 +529,9 @@ class CurationResultsWriter:
             raise FileNotFoundError(f"結果文件不存在: {results_file}")
         
         try:
-            with open(results_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # 以二進制讀取後一次性解析（orjson只接受bytes，UTF-8編碼由JSON規範保證）
+            with open(results_file, 'rb') as f:
+                data = _json_loads(f.read())
             
             logger.info(f"成功載入結果文件: {results_file}")
             logger.info(f"元數據: 總處理 {data['metadata'].get('total_processed', 0)}, "
@@ -185,30 +542,79 @@ class CurationResultsWriter:
             logger.error(f"載入結果文件失敗: {e}")
             raise
     
+    def load_metadata_stream(self, results_file: str) -> Dict[str, Any]:
+        """流式讀取結果文件的元數據，不載入results部分"""
+        if not os.path.exists(results_file):
+            raise FileNotFoundError(f"結果文件不存在: {results_file}")
+        
+        with open(results_file, 'rb') as f:
+            metadata = next(ijson.items(f, 'metadata', use_float=True), {})
+        
+        logger.info(f"成功讀取結果文件元數據: {results_file}")
+        logger.info(f"元數據: 總處理 {metadata.get('total_processed', 0)}, "
+                   f"成功 {metadata.get('total_success', 0)}")
+        return metadata
+    
+    def scan_result_rows(self, results_file: str) -> List[int]:
+        """流式掃描結果文件中的行號（只讀取results的鍵，不構建結果對象）"""
+        row_numbers = []
+        with open(results_file, 'rb') as f:
+            for prefix, event, value in ijson.parse(f):
+                if event == 'map_key' and prefix == 'results':
+                    row_numbers.append(int(value))
+        return row_numbers
+    
+    def iter_results_stream(self, results_file: str):
+        """逐條流式讀取精選評分結果，產出(行號, 結果)，跳過標題行（第6行）"""
+        with open(results_file, 'rb') as f:
+            for row_key, result in ijson.kvitems(f, 'results', use_float=True):
+                row_number = int(row_key)
+                if row_number == 6:
+                    continue
+                yield row_number, result
+    
     def create_output_excel(self, source_file: str, output_file: str, required_rows: set = None) -> tuple:
         """創建輸出Excel文件，根據配置選擇輸出模式"""
         try:
             print("📁 正在載入Excel文件...")
             
+            sheet_name = self._sheet_name
+            
+            # 檢查輸出模式
+            output_mode = self._output_mode
+            
+            # 完整模式可選擇流式處理：唯讀讀取源文件並輸出新文件，不在內存中構建整個工作簿
+            stream_full = output_mode != 'compact' and self._stream_full_mode
+            
             # 載入原始文件
-            source_workbook = load_workbook(source_file)
-            sheet_name = self.config.get('excel', 'sheet_name')
+            # 精簡模式只需讀取少量行，使用唯讀模式流式解析，避免整個工作簿載入內存
+            if output_mode == 'compact' or stream_full:
+                source_workbook = load_workbook(source_file, read_only=True, data_only=True, keep_links=False)
+            else:
+                source_workbook = load_workbook(source_file)
             source_worksheet = source_workbook[sheet_name]
             
             print("✅ Excel文件載入完成")
             
-            # 檢查輸出模式
-            output_mode = self.config.get('excel_output', 'output_mode', fallback='compact')
-            
             if output_mode == 'compact':
                 print("🧹 正在創建精簡工作表...")
-                workbook, worksheet = self._create_compact_excel(source_workbook, source_worksheet, required_rows)
+                try:
+                    workbook, worksheet = self._create_compact_excel(source_workbook, source_worksheet, required_rows)
+                finally:
+                    # 唯讀模式會保持文件句柄，複製完成後立即關閉
+                    source_workbook.close()
+            elif stream_full:
+                print("📋 正在流式復制完整工作表...")
+                try:
+                    workbook, worksheet = self._create_full_streaming_excel(source_worksheet)
+                finally:
+                    source_workbook.close()
             else:
                 print("📋 正在準備完整工作表...")
                 workbook, worksheet = self._create_full_excel(source_workbook, source_worksheet)
-            
-            # 清理工作表，只保留指定的工作表
-            self._clean_worksheets(workbook, sheet_name)
+                
+                # 清理工作表，只保留指定的工作表（精簡模式的新工作簿只有一個工作表）
+                self._clean_worksheets(workbook, sheet_name)
             
             logger.info(f"成功創建Excel文件，輸出模式: {output_mode}")
             return workbook, worksheet
@@ -218,63 +624,134 @@ class CurationResultsWriter:
     
     def _create_compact_excel(self, source_workbook, source_worksheet, required_rows: set):
         """創建精簡Excel工作簿，只包含需要的行"""
-        from openpyxl import Workbook
-        
         # 創建新工作簿
-        workbook = Workbook()
-        worksheet = workbook.active
-        worksheet.title = source_worksheet.title
+        # 寫入內容先緩衝，保存時按行順序流式輸出，不構建完整的openpyxl工作表，保存更快、內存佔用更低
+        backend = self._select_stream_backend(self._preserve_styles)
+        workbook = _StreamingWriter(source_worksheet.title, backend=backend)
+        worksheet = workbook
+        logger.info(f"精簡模式寫入後端: {backend}（復制格式: {self._preserve_styles}）")
         
         # 總是包含標題行(第6行)
         rows_to_copy = {6}
         if required_rows:
             rows_to_copy.update(required_rows)
         
+        # 創建行號映射（原行號 -> 新行號）：需要的行按順序緊密排列，可直接由排序位置得出
+        sorted_rows = sorted(rows_to_copy)
+        self.row_mapping = {original_row: i for i, original_row in enumerate(sorted_rows, start=1)}
+        
         # 記錄標題行的新位置
-        self.title_row_new = None
+        self.title_row_new = self.row_mapping.get(6)
         
-        # 獲取源工作表的最大列數
-        max_col = source_worksheet.max_column
+        self._copy_source_rows(source_worksheet, worksheet, sorted_rows[0], sorted_rows[-1],
+                               self.row_mapping, self._preserve_styles)
         
-        # 創建行號映射（新行號 -> 原行號）
-        self.row_mapping = {}
-        new_row = 1
+        logger.info(f"成功創建精簡工作表，從 {len(rows_to_copy)} 行復制")
+        return workbook, worksheet
+
+    def _copy_source_rows(self, source_worksheet, worksheet, min_row: int, max_row: Optional[int],
+                          row_mapping: Optional[Dict[int, int]], preserve_styles: bool):
+        """
+        將唯讀源工作表中min_row到max_row之間的行復制到目標工作表
+        
+        Args:
+            row_mapping: 原行號 -> 新行號，不在映射中的行跳過；None表示全部復制且行號不變
+            preserve_styles: 是否同時復制單元格格式
+        """
+        # 源樣式索引 -> 樣式對象，每種源樣式只解析一次
+        style_cache = {}
+        
+        # 唯讀模式下每次iter_rows都會從頭解析工作表，因此只做一次有界的順序掃描
+        # 不復制格式時只讀取值，省去為每個單元格創建ReadOnlyCell
+        values_only = not preserve_styles
+        row_iter = source_worksheet.iter_rows(min_row=min_row, max_row=max_row,
+                                              max_col=source_worksheet.max_column, values_only=values_only)
         
         # 按順序復制行
-        for original_row in sorted(rows_to_copy):
+        for original_row, source_row in enumerate(row_iter, start=min_row):
+            if row_mapping is None:
+                new_row = original_row
+            else:
+                new_row = row_mapping.get(original_row)
+                if new_row is None:
+                    continue
+            
             try:
-                # 復制整行數據
-                for col in range(1, max_col + 1):
-                    source_cell = source_worksheet.cell(row=original_row, column=col)
-                    target_cell = worksheet.cell(row=new_row, column=col)
-                    
-                    # 復制值
-                    target_cell.value = source_cell.value
-                    
-                    # 復制格式（如果有的話）
-                    if source_cell.has_style:
-                        target_cell.font = copy(source_cell.font)
-                        target_cell.border = copy(source_cell.border)
-                        target_cell.fill = copy(source_cell.fill)
-                        target_cell.number_format = source_cell.number_format
-                        target_cell.protection = copy(source_cell.protection)
-                        target_cell.alignment = copy(source_cell.alignment)
-                
-                # 記錄行號映射
-                self.row_mapping[original_row] = new_row
-                
-                # 記錄標題行的新位置
-                if original_row == 6:
-                    self.title_row_new = new_row
-                
-                new_row += 1
+                if values_only:
+                    # 只復制非空值
+                    for col, value in enumerate(source_row, start=1):
+                        if value is not None:
+                            worksheet.cell(row=new_row, column=col, value=value)
+                else:
+                    # 復制整行數據
+                    for col, source_cell in enumerate(source_row, start=1):
+                        # 直接讀取樣式索引，0為工作簿默認樣式，無需復制；
+                        # 唯讀模式下缺失的單元格為EmptyCell，沒有樣式索引
+                        style_id = getattr(source_cell, '_style_id', 0)
+                        if source_cell.value is None and not style_id:
+                            continue
+                        
+                        target_cell = worksheet.cell(row=new_row, column=col)
+                        
+                        # 復制值
+                        target_cell.value = source_cell.value
+                        
+                        # 復制格式（如果有的話）
+                        if style_id:
+                            styles = style_cache.get(style_id)
+                            if styles is None:
+                                # 樣式對象賦值後不可變，唯讀單元格返回的是樣式對象本身（非StyleProxy），
+                                # 直接引用即可，無需copy()
+                                styles = style_cache[style_id] = (
+                                    source_cell.font, source_cell.border, source_cell.fill,
+                                    source_cell.number_format, source_cell.protection, source_cell.alignment
+                                )
+                            (target_cell.font, target_cell.border, target_cell.fill,
+                             target_cell.number_format, target_cell.protection, target_cell.alignment) = styles
                 
             except Exception as e:
                 logger.warning(f"復制第 {original_row} 行時出錯: {e}")
+    
+    def _select_stream_backend(self, preserve_styles: bool) -> str:
+        """根據writer_backend配置和已安裝的庫選擇緩衝寫入器的輸出後端"""
+        backend = self._writer_backend
+        if backend not in ('auto', 'xlsxwriter', 'openpyxl'):
+            logger.warning(f"不支持的writer_backend: {backend}，可選值為 auto、xlsxwriter、openpyxl，改為自動選擇")
+            backend = 'auto'
         
-        logger.info(f"成功創建精簡工作表，從 {len(rows_to_copy)} 行復制")
+        # 復制格式需要openpyxl的樣式對象，只能使用openpyxl的write_only模式輸出
+        if preserve_styles:
+            if backend == 'xlsxwriter':
+                logger.warning("復制源文件格式時不支持xlsxwriter後端，改用openpyxl")
+            return 'openpyxl'
+        
+        if backend == 'openpyxl':
+            return 'openpyxl'
+        
+        if not XLSXWRITER_AVAILABLE:
+            if backend == 'xlsxwriter':
+                logger.warning("未安裝xlsxwriter，改用openpyxl寫入。建議安裝: pip install xlsxwriter")
+            return 'openpyxl'
+        
+        return 'xlsxwriter'
+    
+    def _create_full_streaming_excel(self, source_worksheet):
+        """以流式方式創建完整Excel工作簿：從唯讀源工作表逐行復制所有行到新的緩衝寫入器"""
+        backend = self._select_stream_backend(self._preserve_formatting)
+        workbook = _StreamingWriter(source_worksheet.title, backend=backend)
+        worksheet = workbook
+        logger.info(f"完整模式流式寫入後端: {backend}（復制格式: {self._preserve_formatting}）")
+        
+        # 所有行按原行號復制，行號映射與普通完整模式相同
+        self.row_mapping = {}
+        self.title_row_new = 6  # 標題行通常是第6行
+        
+        self._copy_source_rows(source_worksheet, worksheet, 1, source_worksheet.max_row,
+                               None, self._preserve_formatting)
+        
+        logger.info(f"成功流式復制完整工作表，共 {worksheet.max_row} 行")
         return workbook, worksheet
-
+    
     def _create_full_excel(self, source_workbook, source_worksheet):
         """創建完整Excel工作簿，保持原有結構"""
         # 直接返回源工作簿的副本
@@ -291,15 +768,14 @@ class CurationResultsWriter:
     def _clean_worksheets(self, workbook, keep_sheet_name: str):
         """清理工作表，只保留指定的工作表"""
         try:
-            sheets_to_remove = []
-            for sheet_name in workbook.sheetnames:
-                if sheet_name != keep_sheet_name:
-                    sheets_to_remove.append(sheet_name)
+            sheets_to_keep = [sheet for sheet in workbook._sheets if sheet.title == keep_sheet_name]
+            sheets_to_remove = [sheet.title for sheet in workbook._sheets if sheet.title != keep_sheet_name]
             
-            if sheets_to_remove:
+            if sheets_to_remove and sheets_to_keep:
                 logger.info(f"將刪除 {len(sheets_to_remove)} 個工作表: {', '.join(sheets_to_remove)}")
-                for sheet_name in sheets_to_remove:
-                    del workbook[sheet_name]
+                # 一次性替換工作表列表，避免逐個刪除時反覆查找和移動列表元素
+                workbook._sheets = sheets_to_keep
+                workbook.active = 0
                 logger.info(f"只保留工作表: {keep_sheet_name}")
             else:
                 logger.info(f"工作表 {keep_sheet_name} 已是最後一個工作表")
@@ -311,21 +787,18 @@ class CurationResultsWriter:
     def _add_column_headers(self, worksheet):
         """添加列標題"""
         try:
-            # 獲取配置
-            breadth_score_col = self.config.getint('output', 'breadth_score_column')
-            depth_score_col = self.config.getint('output', 'depth_score_column')
-            uniqueness_score_col = self.config.getint('output', 'uniqueness_score_column')
-            overall_score_col = self.config.getint('output', 'overall_score_column')
-            combined_comment_col = self.config.getint('output', 'combined_comment_column')
-            overall_comment_col = self.config.getint('output', 'overall_comment_column')
-            
             # 添加標題行
-            worksheet.cell(row=1, column=breadth_score_col, value="廣度評分")
-            worksheet.cell(row=1, column=depth_score_col, value="深度評分")
-            worksheet.cell(row=1, column=uniqueness_score_col, value="獨特性評分")
-            worksheet.cell(row=1, column=overall_score_col, value="綜合評分")
-            worksheet.cell(row=1, column=combined_comment_col, value="綜合評論")
-            worksheet.cell(row=1, column=overall_comment_col, value="總體評價")
+            headers = (
+                ("廣度評分", self._breadth_score_col),
+                ("深度評分", self._depth_score_col),
+                ("獨特性評分", self._uniqueness_score_col),
+                ("綜合評分", self._overall_score_col),
+                ("綜合評論", self._combined_comment_col),
+                ("總體評價", self._overall_comment_col),
+            )
+            cell = worksheet.cell
+            for text, col in headers:
+                cell(row=1, column=col, value=text)
             
             logger.info("列標題添加完成")
             
@@ -335,72 +808,45 @@ class CurationResultsWriter:
     def write_curation_result(self, worksheet, row: int, result: Dict[str, Any]):
         """寫入精選評分結果到Excel"""
         try:
-            # 獲取輸出列配置
-            breadth_score_col = self.config.getint('output', 'breadth_score_column')
-            depth_score_col = self.config.getint('output', 'depth_score_column')
-            uniqueness_score_col = self.config.getint('output', 'uniqueness_score_column')
-            overall_score_col = self.config.getint('output', 'overall_score_column')
-            combined_comment_col = self.config.getint('output', 'combined_comment_column')
-            overall_comment_col = self.config.getint('output', 'overall_comment_column')
-            
-            # 寫入評分結果
-            if result.get('breadth_score') != '解析失敗':
-                worksheet.cell(row=row, column=breadth_score_col, value=result['breadth_score'])
-            
-            if result.get('depth_score') != '解析失敗':
-                worksheet.cell(row=row, column=depth_score_col, value=result['depth_score'])
+            # 先構建行內容再寫入，結果格式錯誤時只影響本行
+            payload = build_row_payload(result)
+            self._write_row_payload(worksheet, row, payload)
             
-            if result.get('uniqueness_score') != '解析失敗':
-                worksheet.cell(row=row, column=uniqueness_score_col, value=result['uniqueness_score'])
-            
-            if result.get('overall_score') != '解析失敗':
-                worksheet.cell(row=row, column=overall_score_col, value=result['overall_score'])
-            
-            # 合併三個評論到一個欄位
-            combined_comment = self._combine_comments(result)
-            if combined_comment:
-                self._write_cell_with_format(worksheet, row, combined_comment_col, combined_comment)
-            
-            # 寫入總體評價
-            if result.get('overall_comment') != '解析失敗':
-                worksheet.cell(row=row, column=overall_comment_col, value=result['overall_comment'])
-            
-            # 添加摘要評論到問題和答案單元格
-            question_col = self.config.getint('excel', 'question_column')
-            answer_col = self.config.getint('excel', 'answer_column')
-            
-            if result.get('question_summary') != '解析失敗':
-                self._set_cell_comment(worksheet, row, question_col, f"大模型摘要: {result['question_summary']}", "問題摘要")
-            
-            if result.get('answer_summary') != '解析失敗':
-                self._set_cell_comment(worksheet, row, answer_col, f"大模型摘要: {result['answer_summary']}", "回答摘要")
-            
-            logger.info(f"第{row}行精選評分結果寫入完成")
+            # 逐行日誌只在DEBUG級別輸出，使用%格式延遲構建字符串
+            logger.debug("第%d行精選評分結果寫入完成", row)
             
         except Exception as e:
             logger.error(f"寫入第{row}行精選評分結果失敗: {e}")
     
-    def _combine_comments(self, result: Dict[str, Any]) -> str:
-        """合併廣度、深度、獨特性評論到一個欄位"""
-        comments = []
+    def _write_row_payload(self, worksheet, row: int, payload: RowPayload):
+        """將構建好的行內容寫入工作表"""
+        # 寫入評分結果
+        if payload.breadth_score is not None:
+            worksheet.cell(row=row, column=self._breadth_score_col, value=payload.breadth_score)
+        
+        if payload.depth_score is not None:
+            worksheet.cell(row=row, column=self._depth_score_col, value=payload.depth_score)
+        
+        if payload.uniqueness_score is not None:
+            worksheet.cell(row=row, column=self._uniqueness_score_col, value=payload.uniqueness_score)
         
-        # 添加廣度評論
-        breadth_comment = result.get('breadth_comment')
-        if breadth_comment and breadth_comment != '解析失敗':
-            comments.append(f"【廣度評論】\n{breadth_comment}")
+        if payload.overall_score is not None:
+            worksheet.cell(row=row, column=self._overall_score_col, value=payload.overall_score)
         
-        # 添加深度評論
-        depth_comment = result.get('depth_comment')
-        if depth_comment and depth_comment != '解析失敗':
-            comments.append(f"【深度評論】\n{depth_comment}")
+        # 合併三個評論到一個欄位
+        if payload.combined_comment:
+            self._write_cell_with_format(worksheet, row, self._combined_comment_col, payload.combined_comment)
         
-        # 添加獨特性評論
-        uniqueness_comment = result.get('uniqueness_comment')
-        if uniqueness_comment and uniqueness_comment != '解析失敗':
-            comments.append(f"【獨特性評論】\n{uniqueness_comment}")
+        # 寫入總體評價
+        if payload.overall_comment is not None:
+            worksheet.cell(row=row, column=self._overall_comment_col, value=payload.overall_comment)
         
-        # 用雙換行分隔不同類型的評論
-        return '\n\n'.join(comments) if comments else None
+        # 添加摘要評論到問題和答案單元格
+        if payload.question_comment is not None:
+            self._set_cell_comment(worksheet, row, self._question_col, payload.question_comment, "問題摘要")
+        
+        if payload.answer_comment is not None:
+            self._set_cell_comment(worksheet, row, self._answer_col, payload.answer_comment, "回答摘要")
     
     def _write_cell_with_format(self, worksheet, row: int, col: int, value: str):
         """寫入單元格並設置自動換行格式"""
@@ -409,19 +855,10 @@ class CurationResultsWriter:
             cell.value = value
             
             # 設置自動換行
-            cell.alignment = openpyxl.styles.Alignment(
-                wrap_text=True,
-                vertical='top',
-                horizontal='left'
-            )
+            cell.alignment = self._body_align
             
             # 設置邊框樣式
-            cell.border = openpyxl.styles.Border(
-                left=openpyxl.styles.Side(style='thin'),
-                right=openpyxl.styles.Side(style='thin'),
-                top=openpyxl.styles.Side(style='thin'),
-                bottom=openpyxl.styles.Side(style='thin')
-            )
+            cell.border = self._thin_border
             
         except Exception as e:
             logger.error(f"設置單元格格式失敗 (行{row}, 列{col}): {e}")
@@ -429,48 +866,71 @@ class CurationResultsWriter:
     
     def _set_cell_comment(self, worksheet, row: int, col: int, comment_text: str, comment_type: str):
         """設置單元格comment"""
+        # 空白文本直接返回，不獲取單元格也不創建comment
+        if not comment_text or not comment_text.strip():
+            return
+        
         try:
-            if comment_text and comment_text.strip():
-                cell = worksheet.cell(row=row, column=col)
-                
-                # 創建comment對象
-                comment = openpyxl.comments.Comment(
-                    text=comment_text,
-                    author=comment_type
-                )
-                
-                # 設置comment樣式
-                comment.width = 300  # 設置comment寬度
-                comment.height = 150  # 設置comment高度
-                
-                # 將comment添加到單元格
-                cell.comment = comment
-                
-                logger.info(f"✅ 成功添加評論到單元格 (行{row}, 列{col}): {comment_text[:50]}...")
-                
+            # 創建comment對象，同時設置寬高
+            comment = openpyxl.comments.Comment(comment_text, comment_type, height=150, width=300)
+            
+            # 將comment添加到單元格
+            worksheet.cell(row=row, column=col).comment = comment
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("✅ 成功添加評論到單元格 (行%d, 列%d): %s...", row, col, comment_text[:50])
+            
         except Exception as e:
             logger.error(f"❌ 設置comment失敗 (行{row}, 列{col}): {e}")
             # 不拋出異常，讓程序繼續執行
     
-    def process_results(self, input_path: str, output_file: str = None):
-        """處理精選評分結果並寫入Excel"""
+    def process_results(self, input_path: str, output_file: str = None, stream: bool = False):
+        """
+        處理精選評分結果並寫入Excel
+        
+        Args:
+            input_path: 結果JSON文件或批次資料夾路徑
+            output_file: 輸出Excel文件路徑
+            stream: 是否使用ijson流式讀取結果（只支持單個結果文件），結果不整體載入內存
+        """
         # 查找JSON文件
         json_files = self.find_json_files(input_path)
         
+        # 檢查流式讀取條件，不滿足時退回一次性載入
+        if stream and not IJSON_AVAILABLE:
+            logger.warning("未安裝ijson，無法流式讀取，改為一次性載入。建議安裝: pip install ijson")
+            stream = False
+        elif stream and len(json_files) > 1:
+            logger.warning("流式讀取只支持單個結果文件，多個批次文件改為一次性載入合併")
+            stream = False
+        
         # 載入和合併結果
-        if len(json_files) == 1:
-            # 單個文件
-            logger.info("處理單個JSON文件")
-            data = self.load_results(json_files[0])
+        if stream:
+            # 流式模式：先讀取元數據和行號，結果在寫入時逐條讀取
+            logger.info("流式讀取單個JSON文件")
+            metadata = self.load_metadata_stream(json_files[0])
+            sorted_results = None
+            row_numbers = sorted(row for row in self.scan_result_rows(json_files[0]) if row != 6)
         else:
-            # 多個文件，需要合併
-            logger.info(f"處理多個JSON文件，開始合併...")
-            data = self.merge_batch_results(json_files)
-        
-        results = data.get('results', {})
-        metadata = data.get('metadata', {})
+            if len(json_files) == 1:
+                # 單個文件
+                logger.info("處理單個JSON文件")
+                data = self.load_results(json_files[0])
+            else:
+                # 多個文件，需要合併
+                logger.info(f"處理多個JSON文件，開始合併...")
+                data = self.merge_batch_results(json_files)
+            
+            results = data.get('results', {})
+            metadata = data.get('metadata', {})
+            
+            # 行號只轉換一次並排序；跳過標題行（第6行），從第7行開始寫入數據
+            numbered_results = ((int(row_key), result) for row_key, result in results.items())
+            sorted_results = sorted((item for item in numbered_results if item[0] != 6),
+                                    key=operator.itemgetter(0))
+            row_numbers = [row_number for row_number, _ in sorted_results]
         
-        if not results:
+        if not row_numbers:
             logger.warning("沒有找到精選評分結果")
             return
         
@@ -496,11 +956,10 @@ class CurationResultsWriter:
             else:
                 logger.info(f"使用配置文件中的源文件: {source_file}")
         
-        # 獲取需要的行號
-        required_rows = set(int(row_key) for row_key in results.keys())
+        required_rows = set(row_numbers)
         
         # 檢查輸出模式
-        output_mode = self.config.get('excel_output', 'output_mode', fallback='compact')
+        output_mode = self._output_mode
         
         if output_mode == 'compact':
             # 精簡模式：只包含需要的行
@@ -512,7 +971,7 @@ class CurationResultsWriter:
         # 添加新列的標題
         self._add_column_headers(worksheet)
         
-        total_items = len(results)
+        total_items = len(row_numbers)
         logger.info(f"開始寫入 {total_items} 條精選評分結果，輸出模式: {output_mode}")
         print(f"📊 開始處理 {total_items} 條精選評分結果...")
         print(f"🔧 輸出模式: {output_mode}")
@@ -521,57 +980,44 @@ class CurationResultsWriter:
         success_count = 0
         failed_count = 0
         
-        # 按行號排序處理
-        sorted_results = sorted(results.items(), key=lambda x: int(x[0]))
+        # 流式模式逐條讀取結果，否則使用已排序的結果
+        items = self.iter_results_stream(json_files[0]) if stream else sorted_results
         
-        # 使用進度條
+        # 使用進度條：tqdm按時間和條數節流刷新，統計信息在寫入完成後只設置一次
+        pbar = None
         if TQDM_AVAILABLE:
-            pbar = tqdm(sorted_results, desc="寫入精選評分結果", unit="條")
-        else:
-            pbar = sorted_results
-            print("進度: [", end="")
+            pbar = tqdm(total=total_items, desc="寫入精選評分結果", unit="條", miniters=100, mininterval=0.5)
         
-        for i, (row_key, result) in enumerate(pbar):
+        for row_number, result in items:
+            if pbar is not None:
+                pbar.update()
+            
             try:
-                row_number = int(row_key)
-                
-                # 跳過標題行（第6行），從第7行開始寫入數據
-                if row_number == 6:
-                    if not TQDM_AVAILABLE:
-                        print("=", end="", flush=True)
-                    continue
-                
-                # 寫入結果
-                self.write_curation_result(worksheet, row_number, result)
+                # 寫入結果（精簡模式下寫入復制後的新行號）
+                target_row = self.row_mapping.get(row_number, row_number)
+                self.write_curation_result(worksheet, target_row, result)
                 
                 if result.get('status') == 'success':
                     success_count += 1
                 else:
                     failed_count += 1
                 
-                # 更新進度條
-                if not TQDM_AVAILABLE:
-                    print("=", end="", flush=True)
-                
-                # 每處理10條記錄顯示進度
-                if (success_count + failed_count) % 10 == 0:
+                # 無tqdm時每處理一批記錄才輸出一次進度
+                if pbar is None:
                     current_progress = success_count + failed_count
-                    if TQDM_AVAILABLE:
-                        pbar.set_postfix({
-                            '成功': success_count,
-                            '失敗': failed_count,
-                            '進度': f"{current_progress}/{total_items}"
-                        })
-                    else:
-                        print(f"\n進度: {current_progress}/{total_items} (成功: {success_count}, 失敗: {failed_count})", end="")
+                    if current_progress % PROGRESS_UPDATE_EVERY == 0:
+                        print(f"\r進度: {current_progress}/{total_items} (成功: {success_count}, 失敗: {failed_count})", end="", flush=True)
                 
             except Exception as e:
-                logger.error(f"處理行 {row_key} 時發生錯誤: {e}")
+                logger.error(f"處理行 {row_number} 時發生錯誤: {e}")
                 failed_count += 1
                 continue
         
-        if not TQDM_AVAILABLE:
-            print("] 完成!")
+        if pbar is not None:
+            pbar.set_postfix({'成功': success_count, '失敗': failed_count})
+            pbar.close()
+        else:
+            print(f"\r進度: {success_count + failed_count}/{total_items} 完成!")
         
         print(f"✅ 數據寫入完成: 成功 {success_count} 條，失敗 {failed_count} 條")
         
@@ -592,7 +1038,11 @@ class CurationResultsWriter:
         # 保存Excel文件
         print("💾 正在保存Excel文件...")
         try:
-            workbook.save(output_file)
+            # 先在內存中生成完整文件，再一次性寫入磁盤，避免大量零碎的小塊寫入
+            buffer = io.BytesIO()
+            workbook.save(buffer)
+            with open(output_file, 'wb') as f:
+                f.write(buffer.getbuffer())
             print("✅ Excel文件保存完成!")
             logger.info(f"✅ Excel文件已保存: {output_file}")
             logger.info(f"📊 統計: 成功寫入 {success_count} 條，失敗 {failed_count} 條")
@@ -616,119 +1066,123 @@ class CurationResultsWriter:
     def _auto_adjust_columns_and_rows(self, worksheet):
         """自動調整列寬和行高"""
         try:
-            # 獲取輸出列配置
-            breadth_score_col = self.config.getint('output', 'breadth_score_column')
-            depth_score_col = self.config.getint('output', 'depth_score_column')
-            uniqueness_score_col = self.config.getint('output', 'uniqueness_score_column')
-            overall_score_col = self.config.getint('output', 'overall_score_column')
-            combined_comment_col = self.config.getint('output', 'combined_comment_column')
-            overall_comment_col = self.config.getint('output', 'overall_comment_column')
+            # 預先計算列號對應的列字母
+            score_columns = [
+                (col, _get_col_letter(col))
+                for col in [self._breadth_score_col, self._depth_score_col,
+                            self._uniqueness_score_col, self._overall_score_col]
+            ]
+            comment_columns = [
+                (col, _get_col_letter(col))
+                for col in [self._combined_comment_col, self._overall_comment_col]
+            ]
             
             # 調整評分列寬度（數字列，固定寬度）
-            for col in [breadth_score_col, depth_score_col, uniqueness_score_col, overall_score_col]:
-                worksheet.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 15
+            for col, letter in score_columns:
+                worksheet.column_dimensions[letter].width = 15
             
             # 調整評論列寬度（文本列，適中寬度，支持自動換行）
             # 合併評論欄位需要更寬的寬度，因為包含三種評論
-            for col in [combined_comment_col, overall_comment_col]:
-                if col == combined_comment_col:
+            for col, letter in comment_columns:
+                if col == self._combined_comment_col:
                     # 合併評論欄位設置更寬的寬度
-                    worksheet.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 60
+                    worksheet.column_dimensions[letter].width = 60
                 else:
                     # 總體評價欄位保持原寬度
-                    worksheet.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 40
-                
-                # 設置自動換行
-                for row in range(1, worksheet.max_row + 1):
-                    cell = worksheet.cell(row=row, column=col)
-                    if cell.value:
-                        cell.alignment = openpyxl.styles.Alignment(wrap_text=True, vertical='top')
+                    worksheet.column_dimensions[letter].width = 40
+            
+            # 設置自動換行：一次掃描評論列的值，只對有內容的單元格設置，不為空行創建單元格
+            min_col = min(col for col, _ in comment_columns)
+            max_col = max(col for col, _ in comment_columns)
+            offsets = [(col, col - min_col) for col, _ in comment_columns]
+            rows = _iter_row_values(worksheet, 1, worksheet.max_row, min_col, max_col)
+            for row_idx, row in enumerate(rows, start=1):
+                for col, offset in offsets:
+                    if row[offset]:
+                        worksheet.cell(row=row_idx, column=col).alignment = self._wrap_alignment
             
             logger.info("列寬自動調整完成，評論列已設置自動換行")
             
         except Exception as e:
             logger.error(f"自動調整列寬失敗: {e}")
     
-    def _adjust_column_width(self, worksheet, col: int, max_width: int, min_width: int, col_name: str = None):
-        """調整單列寬度"""
+    def _adjust_column_widths(self, worksheet, columns: List[Dict[str, Any]]):
+        """一次逐行掃描工作表，同時計算多列的最大內容寬度並調整列寬"""
         try:
-            # 計算該列的最大內容長度
-            max_length = min_width
             total_rows = worksheet.max_row
+            max_lengths = {c['col']: c['min_width'] for c in columns}
             
-            # 使用進度條處理大量行
-            if TQDM_AVAILABLE and total_rows > 1000:
-                row_range = tqdm(range(1, total_rows + 1), desc=f"調整{col_name or f'列{openpyxl.utils.get_column_letter(col)}'}", leave=False)
-            else:
-                row_range = range(1, total_rows + 1)
-            
-            for row in row_range:
-                cell = worksheet.cell(row=row, column=col)
-                if cell.value:
-                    # 計算文本長度（中文字符算2個字符寬度）
-                    text_length = self._calculate_text_width(str(cell.value))
-                    max_length = max(max_length, text_length)
+            # 只讀取被調整列所在的列範圍，每行按偏移取值
+            min_col = min(max_lengths)
+            max_col = max(max_lengths)
+            offsets = [(col, col - min_col) for col in max_lengths]
             
-            # 限制最大寬度
-            adjusted_width = min(max_length + 2, max_width)  # +2 為邊距
+            # 評論列需要自動換行：掃描時順便記錄非空單元格所在行，之後只訪問這些單元格
+            wrap_rows = {
+                c['col']: [] for c in columns
+                if c.get('name') and ('評論' in c['name'] or '評價' in c['name'])
+            }
             
-            # 設置列寬
-            worksheet.column_dimensions[openpyxl.utils.get_column_letter(col)].width = adjusted_width
+            rows = _iter_row_values(worksheet, 1, total_rows, min_col, max_col)
+            # 使用進度條處理大量行
+            if TQDM_AVAILABLE and total_rows > 1000:
+                rows = tqdm(rows, total=total_rows, desc="調整列寬", leave=False)
             
-            # 如果是評論列，設置自動換行
-            if col_name and '評論' in col_name or col_name and '評價' in col_name:
-                for row in range(1, total_rows + 1):
-                    cell = worksheet.cell(row=row, column=col)
-                    if cell.value:
-                        cell.alignment = openpyxl.styles.Alignment(wrap_text=True, vertical='top')
+            for row_idx, row in enumerate(rows, start=1):
+                for col, offset in offsets:
+                    value = row[offset]
+                    if value:
+                        # 計算文本長度（中文字符算2個字符寬度）
+                        text_length = self._calculate_text_width(str(value))
+                        if text_length > max_lengths[col]:
+                            max_lengths[col] = text_length
+                        if col in wrap_rows:
+                            wrap_rows[col].append(row_idx)
             
-            logger.debug(f"列 {col_name or openpyxl.utils.get_column_letter(col)} 寬度調整為: {adjusted_width}")
+            for col_config in columns:
+                col = col_config['col']
+                col_name = col_config.get('name')
+                letter = _get_col_letter(col)
+                
+                # 限制最大寬度
+                adjusted_width = min(max_lengths[col] + 2, col_config['max_width'])  # +2 為邊距
+                
+                # 設置列寬
+                worksheet.column_dimensions[letter].width = adjusted_width
+                
+                # 如果是評論列，為有內容的單元格設置自動換行
+                for row in wrap_rows.get(col, ()):
+                    worksheet.cell(row=row, column=col).alignment = self._wrap_alignment
+                
+                logger.debug(f"列 {col_name or letter} 寬度調整為: {adjusted_width}")
             
         except Exception as e:
-            logger.error(f"調整列 {col_name or col} 寬度失敗: {e}")
+            logger.error(f"調整列寬度失敗: {e}")
     
     def _calculate_text_width(self, text: str) -> int:
-        """計算文本寬度（中文字符算2個字符寬度，標點符號算1個字符寬度）"""
-        width = 0
-        for char in text:
-            if ord(char) > 127:  # 中文字符
-                width += 2
-            elif char in '，。！？；：""''（）【】《》':  # 中文標點符號
-                width += 1
-            else:  # 英文字符和英文標點
-                width += 1
-        return width
+        """計算文本寬度（中文等非ASCII字符算2個字符寬度，英文字符和英文標點算1個字符寬度）"""
+        # 純ASCII文本（數字、英文）寬度即長度，isascii無需分配新字符串
+        if text.isascii():
+            return len(text)
+        # encode在C層面去掉所有非ASCII字符，長度差即為非ASCII字符數，避免逐字符的Python循環
+        non_ascii_count = len(text) - len(text.encode('ascii', 'ignore'))
+        return len(text) + non_ascii_count
     
     def _adjust_scoring_columns_only(self, worksheet):
         """只調整評分相關列的寬度（完整模式）"""
         try:
-            # 獲取輸出列配置
-            breadth_score_col = self.config.getint('output', 'breadth_score_column')
-            depth_score_col = self.config.getint('output', 'depth_score_column')
-            uniqueness_score_col = self.config.getint('output', 'uniqueness_score_column')
-            overall_score_col = self.config.getint('output', 'overall_score_column')
-            combined_comment_col = self.config.getint('output', 'combined_comment_column')
-            overall_comment_col = self.config.getint('output', 'overall_comment_column')
-            
             # 只調整評分相關列
             scoring_columns = [
-                {'col': breadth_score_col, 'min_width': 12, 'max_width': 18, 'name': '廣度評分'},
-                {'col': depth_score_col, 'min_width': 12, 'max_width': 18, 'name': '深度評分'},
-                {'col': uniqueness_score_col, 'min_width': 12, 'max_width': 18, 'name': '獨特性評分'},
-                {'col': overall_score_col, 'min_width': 12, 'max_width': 18, 'name': '綜合評分'},
-                {'col': combined_comment_col, 'min_width': 50, 'max_width': 80, 'name': '綜合評論'},
-                {'col': overall_comment_col, 'min_width': 30, 'max_width': 40, 'name': '總體評價'},
+                {'col': self._breadth_score_col, 'min_width': 12, 'max_width': 18, 'name': '廣度評分'},
+                {'col': self._depth_score_col, 'min_width': 12, 'max_width': 18, 'name': '深度評分'},
+                {'col': self._uniqueness_score_col, 'min_width': 12, 'max_width': 18, 'name': '獨特性評分'},
+                {'col': self._overall_score_col, 'min_width': 12, 'max_width': 18, 'name': '綜合評分'},
+                {'col': self._combined_comment_col, 'min_width': 50, 'max_width': 80, 'name': '綜合評論'},
+                {'col': self._overall_comment_col, 'min_width': 30, 'max_width': 40, 'name': '總體評價'},
             ]
             
-            # 調整評分相關列的寬度
-            for col_config in scoring_columns:
-                self._adjust_column_width(
-                    worksheet, 
-                    col_config['col'], 
-                    col_config['max_width'], 
-                    col_config['min_width'],
-                    col_config['name']
-                )
+            # 一次掃描同時調整所有評分相關列的寬度
+            self._adjust_column_widths(worksheet, scoring_columns)
             
             logger.info("評分相關列寬度調整完成")
             
@@ -751,11 +1205,16 @@ def main():
   
   # 指定輸出文件
   python3 results_to_excel.py batch_results_20250825_152547/ -o output.xlsx
+  
+  # 流式讀取超大結果文件（需要安裝ijson）
+  python3 results_to_excel.py results.json --stream
         """
     )
     parser.add_argument('input_path', help='精選評分結果JSON文件路徑或包含批次文件的資料夾路徑')
     parser.add_argument('-o', '--output', help='輸出Excel文件路徑（可選）')
     parser.add_argument('-c', '--config', default='config.ini', help='配置文件路徑')
+    parser.add_argument('--stream', action='store_true',
+                        help='使用ijson流式讀取結果文件，降低超大結果文件的內存佔用（只支持單個文件）')
     
     args = parser.parse_args()
     
@@ -764,7 +1223,7 @@ def main():
     
     try:
         writer = CurationResultsWriter(args.config)
-        output_file = writer.process_results(args.input_path, args.output)
+        output_file = writer.process_results(args.input_path, args.output, stream=args.stream)
         
         print(f"\n✅ 處理完成！")
         print(f"📁 輸出文件: {output_file}")
@@ -7,109 +7,188 @@
 import openpyxl
 import sys
 
+# 嘗試導入python-calamine（Rust實現的讀取器），讀取單元格的值比openpyxl快得多
+try:
+    from python_calamine import CalamineWorkbook
+    CALAMINE_AVAILABLE = True
+except ImportError:
+    CALAMINE_AVAILABLE = False
+
+# 檢查的行（根據結果文件中的行號）
+SPECIFIC_ROWS = (82, 86, 292, 332, 405, 463, 464, 466, 481, 492, 512)
+_SPECIFIC_ROW_SET = frozenset(SPECIFIC_ROWS)
+_LAST_SPECIFIC_ROW = max(SPECIFIC_ROWS)
+
+# 檢查的評分相關列：列號和列名分開存放，掃描時只用列號
+SCORING_COL_NUMS = (24, 25, 26, 27, 28, 29, 30, 31)
+SCORING_COL_NAMES = ("廣度評分", "深度評分", "獨特性評分", "綜合評分",
+                     "廣度評論", "深度評論", "獨特性評論", "總體評價")
+_MIN_SCORING_COL = min(SCORING_COL_NUMS)
+_MAX_SCORING_COL = max(SCORING_COL_NUMS)
+
+QUESTION_COL = 18  # R列
+ANSWER_COL = 19    # S列
+
+# 所有檢查列的列字母
+COL_LETTERS = {
+    col_num: openpyxl.utils.get_column_letter(col_num)
+    for col_num in SCORING_COL_NUMS + (QUESTION_COL, ANSWER_COL)
+}
+
+def _read_sheet_layout(excel_file, comment_cols, rows):
+    """
+    以普通模式載入一次，讀取工作表信息、列寬和指定單元格的評論後立即關閉
+    （唯讀模式和calamine都不提供列寬和評論）
+    
+    Returns:
+        (工作表名稱, 總行數, 總列數, 列號 -> 寬度, 列號 -> (行號, 評論內容))，
+        每列只記錄第一條找到的評論
+    """
+    # 只讀取列寬和評論，不需要外部鏈接和公式
+    workbook = openpyxl.load_workbook(excel_file, data_only=True, keep_links=False)
+    try:
+        worksheet = workbook.active
+        widths = {
+            col_num: worksheet.column_dimensions[col_letter].width
+            for col_num, col_letter in COL_LETTERS.items()
+        }
+        
+        comments = {}
+        for col_num in comment_cols:
+            for row in rows:
+                if row <= worksheet.max_row:
+                    cell = worksheet.cell(row=row, column=col_num)
+                    if cell.comment:
+                        comments[col_num] = (row, cell.comment.text)
+                        break
+        
+        return worksheet.title, worksheet.max_row, worksheet.max_column, widths, comments
+    finally:
+        workbook.close()
+
+def _normalize_calamine_value(value):
+    """將calamine的值轉為與openpyxl一致：整數值的浮點數轉為int，空字符串轉為None"""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if value == '':
+        return None
+    return value
+
+def _iter_value_rows(excel_file, sheet_name, max_row, min_col, max_col):
+    """
+    從第1行到max_row逐行返回min_col..max_col範圍內的單元格值
+    
+    已安裝python-calamine時使用calamine讀取，否則使用openpyxl唯讀模式流式讀取
+    """
+    width = max_col - min_col + 1
+    if CALAMINE_AVAILABLE:
+        with CalamineWorkbook.from_path(excel_file) as workbook:
+            sheet_rows = workbook.get_sheet_by_name(sheet_name).to_python(
+                skip_empty_area=False, nrows=max_row)
+        for row in sheet_rows:
+            values = [_normalize_calamine_value(value) for value in row[min_col - 1:max_col]]
+            values.extend([None] * (width - len(values)))
+            yield tuple(values)
+        return
+    
+    workbook = openpyxl.load_workbook(excel_file, read_only=True, data_only=True, keep_links=False)
+    try:
+        yield from workbook[sheet_name].iter_rows(min_row=1, max_row=max_row,
+                                                  min_col=min_col, max_col=max_col, values_only=True)
+    finally:
+        workbook.close()
+
 def test_column_widths(excel_file):
     """測試Excel文件的列寬設置"""
+    # 輸出先緩衝到列表中，最後一次性寫出
+    out = []
     try:
-        print(f"📊 檢查Excel文件: {excel_file}")
-        print("=" * 60)
+        out.append(f"📊 檢查Excel文件: {excel_file}")
+        out.append("=" * 60)
         
-        # 載入Excel文件
-        workbook = openpyxl.load_workbook(excel_file)
-        worksheet = workbook.active
+        # 列寬和評論只能在普通模式下讀取
+        sheet_name, max_row, max_column, widths, comments = _read_sheet_layout(
+            excel_file, [QUESTION_COL, ANSWER_COL], SPECIFIC_ROWS
+        )
         
-        print(f"📋 工作表名稱: {worksheet.title}")
-        print(f"📏 總行數: {worksheet.max_row}")
-        print(f"📏 總列數: {worksheet.max_column}")
-        print()
+        out.append(f"📋 工作表名稱: {sheet_name}")
+        out.append(f"📏 總行數: {max_row}")
+        out.append(f"📏 總列數: {max_column}")
+        out.append("")
         
-        # 檢查評分相關列的寬度
-        scoring_columns = [
-            (24, "廣度評分"),
-            (25, "深度評分"),
-            (26, "獨特性評分"),
-            (27, "綜合評分"),
-            (28, "廣度評論"),
-            (29, "深度評論"),
-            (30, "獨特性評論"),
-            (31, "總體評價")
-        ]
+        # 單元格的值只做一次順序掃描，範圍限制在評分相關列內，按列偏移取值並直接更新每列的統計
+        min_col = _MIN_SCORING_COL
+        headers = {}
+        max_content_lengths = dict.fromkeys(SCORING_COL_NUMS, 0)
+        sample_contents = dict.fromkeys(SCORING_COL_NUMS, "")
+        for row_idx, row_values in enumerate(
+                _iter_value_rows(excel_file, sheet_name, _LAST_SPECIFIC_ROW, min_col, _MAX_SCORING_COL), start=1):
+            if row_idx == 1:
+                headers = {col_num: row_values[col_num - min_col] for col_num in SCORING_COL_NUMS}
+                continue
+            if row_idx not in _SPECIFIC_ROW_SET:
+                continue
+            for col_num in SCORING_COL_NUMS:
+                value = row_values[col_num - min_col]
+                if value:
+                    content = value if isinstance(value, str) else str(value)
+                    content_length = len(content)
+                    if content_length > max_content_lengths[col_num]:
+                        max_content_lengths[col_num] = content_length
+                        sample_contents[col_num] = content[:100] + "..." if content_length > 100 else content
         
-        print("🔍 評分相關列寬度檢查:")
-        print("-" * 40)
+        out.append("🔍 評分相關列寬度檢查:")
+        out.append("-" * 40)
         
-        for col_num, col_name in scoring_columns:
-            if col_num <= worksheet.max_column:
-                col_letter = openpyxl.utils.get_column_letter(col_num)
-                col_width = worksheet.column_dimensions[col_letter].width
+        # 檢查評分相關列的寬度
+        for col_num, col_name in zip(SCORING_COL_NUMS, SCORING_COL_NAMES):
+            if col_num <= max_column:
+                col_letter = COL_LETTERS[col_num]
+                col_width = widths[col_num]
                 
                 # 檢查列標題
-                header_cell = worksheet.cell(row=1, column=col_num)
-                header_value = header_cell.value if header_cell.value else "無標題"
+                header_value = headers.get(col_num) or "無標題"
                 
-                print(f"列 {col_letter} ({col_num}): {col_name}")
-                print(f"  標題: {header_value}")
-                print(f"  寬度: {col_width}")
+                out.append(f"列 {col_letter} ({col_num}): {col_name}")
+                out.append(f"  標題: {header_value}")
+                out.append(f"  寬度: {col_width}")
                 
                 # 檢查內容長度
-                max_content_length = 0
-                sample_content = ""
-                # 檢查特定的行（根據結果文件中的行號）
-                specific_rows = [82, 86, 292, 332, 405, 463, 464, 466, 481, 492, 512]
-                for row in specific_rows:
-                    if row <= worksheet.max_row:
-                        cell = worksheet.cell(row=row, column=col_num)
-                        if cell.value:
-                            content = str(cell.value)
-                            if len(content) > max_content_length:
-                                max_content_length = len(content)
-                                sample_content = content[:100] + "..." if len(content) > 100 else content
-                
-                print(f"  最大內容長度: {max_content_length}")
-                print(f"  樣本內容: {sample_content}")
-                print()
+                out.append(f"  最大內容長度: {max_content_lengths[col_num]}")
+                out.append(f"  樣本內容: {sample_contents[col_num]}")
+                out.append("")
             else:
-                print(f"列 {col_num}: 超出範圍")
-                print()
+                out.append(f"列 {col_num}: 超出範圍")
+                out.append("")
         
         # 檢查問題和答案列
-        print("🔍 問題和答案列檢查:")
-        print("-" * 40)
-        
-        question_col = 18  # R列
-        answer_col = 19    # S列
+        out.append("🔍 問題和答案列檢查:")
+        out.append("-" * 40)
         
-        # 檢查特定行的評論
-        specific_rows = [82, 86, 292, 332, 405, 463, 464, 466, 481, 492, 512]
-        
-        for col_num, col_name in [(question_col, "問題"), (answer_col, "答案")]:
-            if col_num <= worksheet.max_column:
-                col_letter = openpyxl.utils.get_column_letter(col_num)
-                col_width = worksheet.column_dimensions[col_letter].width
-                
-                print(f"列 {col_letter} ({col_num}): {col_name}")
-                print(f"  寬度: {col_width}")
+        for col_num, col_name in [(QUESTION_COL, "問題"), (ANSWER_COL, "答案")]:
+            if col_num <= max_column:
+                col_letter = COL_LETTERS[col_num]
+                col_width = widths[col_num]
                 
-                # 檢查是否有評論
-                comment_found = False
-                for row in specific_rows:
-                    if row <= worksheet.max_row:
-                        cell = worksheet.cell(row=row, column=col_num)
-                        if cell.comment:
-                            comment_found = True
-                            print(f"  行{row}有評論: 是")
-                            print(f"  評論內容: {cell.comment.text[:100]}...")
-                            break
+                out.append(f"列 {col_letter} ({col_num}): {col_name}")
+                out.append(f"  寬度: {col_width}")
                 
-                if not comment_found:
-                    print(f"  在檢查的行中沒有找到評論")
-                print()
+                # 檢查特定行的評論
+                if col_num in comments:
+                    row, comment_text = comments[col_num]
+                    out.append(f"  行{row}有評論: 是")
+                    out.append(f"  評論內容: {comment_text[:100]}...")
+                else:
+                    out.append(f"  在檢查的行中沒有找到評論")
+                out.append("")
         
-        workbook.close()
-        print("✅ 列寬檢查完成")
+        out.append("✅ 列寬檢查完成")
         
     except Exception as e:
-        print(f"❌ 檢查失敗: {e}")
+        out.append(f"❌ 檢查失敗: {e}")
         return False
+    finally:
+        sys.stdout.write("\n".join(out) + "\n")
     
     return True
 
@@ -7,28 +7,109 @@
 
 import os
 import sys
+import re
 import json
+import tempfile
+import threading
+import configparser
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from io import BytesIO, StringIO
 from datetime import datetime
 
+# 讓後續測試可以從當前目錄導入qa_curator和results_to_excel
+sys.path.append('.')
+
+# 提示詞模板必須包含的關鍵詞（使用簡體中文）
+REQUIRED_KEYWORDS = (
+    '广度评分', '深度评分', '独特性评分', '综合评分',
+    '广度评论', '深度评论', '独特性评论', '总体评价',
+    '问题摘要', '回答摘要'
+)
+
+# 用一個正則表達式掃描一遍模板即可找出所有出現的關鍵詞
+_KEYWORD_PATTERN = re.compile('|'.join(map(re.escape, REQUIRED_KEYWORDS)))
+
+class _ThreadBufferedStdout:
+    """按線程緩衝的標準輸出：設置了緩衝區的線程寫入自己的緩衝區，其他線程直接寫入原輸出"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def _target(self):
+        buffer = getattr(self._local, 'buffer', None)
+        return self._stream if buffer is None else buffer
+    
+    def start_buffer(self):
+        self._local.buffer = StringIO()
+    
+    def stop_buffer(self):
+        """結束當前線程的緩衝並返回緩衝的內容"""
+        output = self._local.buffer.getvalue()
+        self._local.buffer = None
+        return output
+    
+    def write(self, text):
+        return self._target().write(text)
+    
+    def flush(self):
+        self._target().flush()
+    
+    def __getattr__(self, name):
+        # encoding、isatty、fileno等其他屬性交給原輸出
+        return getattr(self._stream, name)
+
+def _run_tests_parallel(tests):
+    """
+    並行運行相互獨立的測試，每個測試的輸出單獨緩衝
+    
+    Returns:
+        按測試順序排列的 (是否通過, 輸出內容) 列表
+    """
+    original_stdout = sys.stdout
+    buffered_stdout = _ThreadBufferedStdout(original_stdout)
+    
+    def run(test):
+        buffered_stdout.start_buffer()
+        try:
+            passed = bool(test())
+        except Exception as e:
+            print(f"❌ 測試執行失敗: {e}")
+            passed = False
+        return passed, buffered_stdout.stop_buffer()
+    
+    sys.stdout = buffered_stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            return list(executor.map(run, tests))
+    finally:
+        sys.stdout = original_stdout
+
+@lru_cache(maxsize=1)
+def _template():
+    """讀取提示詞模板（只讀取一次，多個測試共用）"""
+    with open('prompt_template.txt', 'r', encoding='utf-8') as f:
+        return f.read()
+
+@lru_cache(maxsize=1)
+def get_config():
+    """解析config.ini（只解析一次，各配置測試共用，調用方只讀取不修改）"""
+    config = configparser.ConfigParser()
+    config.read('config.ini', encoding='utf-8')
+    return config
+
 def test_prompt_template():
     """測試提示詞模板"""
     print("🧪 測試提示詞模板...")
     
     try:
-        with open('prompt_template.txt', 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # 檢查關鍵詞（使用簡體中文）
-        required_keywords = [
-            '广度评分', '深度评分', '独特性评分', '综合评分',
-            '广度评论', '深度评论', '独特性评论', '总体评价',
-            '问题摘要', '回答摘要'
-        ]
+        content = _template()
         
-        missing_keywords = []
-        for keyword in required_keywords:
-            if keyword not in content:
-                missing_keywords.append(keyword)
+        # 檢查關鍵詞
+        found_keywords = set(_KEYWORD_PATTERN.findall(content))
+        missing_keywords = [keyword for keyword in REQUIRED_KEYWORDS if keyword not in found_keywords]
         
         if missing_keywords:
             print(f"❌ 提示詞模板缺少關鍵詞: {', '.join(missing_keywords)}")
@@ -46,9 +127,7 @@ def test_config_file():
     print("🧪 測試配置文件...")
     
     try:
-        import configparser
-        config = configparser.ConfigParser()
-        config.read('config.ini', encoding='utf-8')
+        config = get_config()
         
         # 檢查必要的配置項
         required_sections = ['excel', 'output', 'processing', 'filter']
@@ -103,13 +182,9 @@ def test_python_modules():
         'openai', 'openpyxl', 'pandas', 'configparser'
     ]
     
-    missing_modules = []
-    
-    for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
-            missing_modules.append(module)
+    # 只檢查模塊是否可找到，不執行模塊的初始化代碼（pandas等導入很慢）
+    missing_modules = [module for module in required_modules
+                       if importlib.util.find_spec(module) is None]
     
     if missing_modules:
         print(f"❌ 缺少Python模塊: {', '.join(missing_modules)}")
@@ -124,8 +199,7 @@ def test_curator_class():
     print("🧪 測試精選器類...")
     
     try:
-        # 動態導入精選器類
-        sys.path.append('.')
+        # 延遲導入：只在需要時導入，模塊檢查失敗時不會白白載入openai、pandas等大型庫
         from qa_curator import BuddhistQACurator
         
         # 創建實例（不初始化API）
@@ -158,8 +232,7 @@ def test_excel_writer():
     print("🧪 測試Excel寫入器...")
     
     try:
-        # 動態導入Excel寫入器類
-        sys.path.append('.')
+        # 延遲導入：只在需要時導入，模塊檢查失敗時不會白白載入openpyxl等大型庫
         from results_to_excel import CurationResultsWriter
         
         # 創建實例
@@ -186,13 +259,121 @@ def test_excel_writer():
         print(f"❌ Excel寫入器檢查失敗: {e}")
         return False
 
+def test_streaming_writer():
+    """測試精簡模式的緩衝寫入器（各寫入後端）"""
+    print("🧪 測試緩衝寫入器...")
+    
+    try:
+        # 延遲導入：只在需要時導入，模塊檢查失敗時不會白白載入openpyxl等大型庫
+        import openpyxl
+        from results_to_excel import _StreamingWriter, XLSXWRITER_AVAILABLE
+        
+        # 帶comment的單元格後面緊跟純值單元格，檢查comment不會被帶到後面的單元格
+        expected_values = {(1, 1): '標題', (2, 1): '問題一', (2, 2): 8, (3, 1): '問題二', (3, 2): 7.5}
+        expected_comments = {(2, 1): '大模型摘要: 問題一的摘要'}
+        
+        backends = ['openpyxl'] + (['xlsxwriter'] if XLSXWRITER_AVAILABLE else [])
+        for backend in backends:
+            writer = _StreamingWriter('測試', backend=backend)
+            for (row, col), value in expected_values.items():
+                writer.cell(row=row, column=col, value=value)
+            for (row, col), text in expected_comments.items():
+                writer.cell(row=row, column=col).comment = openpyxl.comments.Comment(
+                    text, '問題摘要', height=150, width=300)
+            
+            output = BytesIO()
+            writer.save(output)
+            output.seek(0)
+            
+            workbook = openpyxl.load_workbook(output)
+            worksheet = workbook.active
+            values = {}
+            comments = {}
+            for row in worksheet.iter_rows():
+                for cell in row:
+                    if cell.value is not None:
+                        values[(cell.row, cell.column)] = cell.value
+                    if cell.comment is not None:
+                        comments[(cell.row, cell.column)] = cell.comment.text
+            workbook.close()
+            
+            if values != expected_values:
+                print(f"❌ {backend}後端寫入的值不正確: {values}")
+                return False
+            if comments != expected_comments:
+                print(f"❌ {backend}後端寫入的comment不正確: {comments}")
+                return False
+        
+        # 無法寫入Excel的值應在賦值時就拋出ValueError，而不是保存時才失敗
+        try:
+            _StreamingWriter('測試').cell(row=1, column=1, value=['a', 'b'])
+        except ValueError:
+            pass
+        else:
+            print("❌ 緩衝寫入器沒有拒絕無法寫入Excel的值")
+            return False
+        
+        print(f"✅ 緩衝寫入器檢查通過（{', '.join(backends)}）")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 緩衝寫入器檢查失敗: {e}")
+        return False
+
+def test_stream_reader():
+    """測試結果文件的流式讀取（--stream）"""
+    print("🧪 測試結果文件流式讀取...")
+    
+    try:
+        from results_to_excel import CurationResultsWriter, IJSON_AVAILABLE
+        
+        if not IJSON_AVAILABLE:
+            print("⚠️  未安裝ijson，跳過流式讀取檢查")
+            return True
+        
+        data = {
+            'metadata': {'total_processed': 3, 'total_success': 3},
+            'results': {
+                '6': {'title': '標題行'},
+                '8': {'breadth_score': 8, 'question_summary': '問題摘要'},
+                '12': {'breadth_score': 7.5, 'overall_comment': '總體評價'}
+            }
+        }
+        
+        writer = CurationResultsWriter.__new__(CurationResultsWriter)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            results_file = os.path.join(temp_dir, 'results.json')
+            with open(results_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            
+            metadata = writer.load_metadata_stream(results_file)
+            row_numbers = writer.scan_result_rows(results_file)
+            results = list(writer.iter_results_stream(results_file))
+        
+        if metadata != data['metadata']:
+            print(f"❌ 流式讀取的元數據不正確: {metadata}")
+            return False
+        if row_numbers != [6, 8, 12]:
+            print(f"❌ 流式掃描的行號不正確: {row_numbers}")
+            return False
+        # 第6行是標題行，流式讀取時應跳過
+        if results != [(8, data['results']['8']), (12, data['results']['12'])]:
+            print(f"❌ 流式讀取的結果不正確: {results}")
+            return False
+        
+        print("✅ 結果文件流式讀取檢查通過")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 結果文件流式讀取檢查失敗: {e}")
+        return False
+
 def test_sample_prompt():
     """測試示例提示詞"""
     print("🧪 測試示例提示詞...")
     
     try:
-        with open('prompt_template.txt', 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = _template()
         
         # 測試格式化
         test_question = "什麼是佛法？"
@@ -216,9 +397,7 @@ def test_filter_mode_config():
     print("🧪 測試過濾模式配置...")
     
     try:
-        import configparser
-        config = configparser.ConfigParser()
-        config.read('config.ini', encoding='utf-8')
+        config = get_config()
         
         # 檢查過濾模式配置
         if not config.has_section('filter'):
@@ -256,9 +435,7 @@ def test_excel_output_config():
     print("🧪 測試Excel輸出模式配置...")
     
     try:
-        import configparser
-        config = configparser.ConfigParser()
-        config.read('config.ini', encoding='utf-8')
+        config = get_config()
         
         # 檢查Excel輸出模式配置
         if not config.has_section('excel_output'):
@@ -295,26 +472,31 @@ def main():
     print("🚀 佛學問答精選器系統測試（含列值過濾和雙輸出模式）")
     print("=" * 70)
     
+    # 先檢查依賴模塊：缺少模塊時後續測試的導入也會失敗，直接結束以免白白導入大型庫
+    if not test_python_modules():
+        print("\n" + "=" * 70)
+        print("⚠️  缺少必要的Python模塊，已跳過其餘測試。")
+        return 1
+    
     tests = [
-        test_python_modules,
         test_config_file,
         test_prompt_template,
         test_curator_class,
         test_excel_writer,
+        test_streaming_writer,
+        test_stream_reader,
         test_sample_prompt,
         test_filter_mode_config,
         test_excel_output_config
     ]
     
-    passed = 0
-    total = len(tests)
+    total = len(tests) + 1
     
-    for test in tests:
-        try:
-            if test():
-                passed += 1
-        except Exception as e:
-            print(f"❌ 測試執行失敗: {e}")
+    # 測試之間沒有共享狀態，並行運行以重疊模塊導入和文件讀取的等待時間，再按順序輸出結果
+    results = _run_tests_parallel(tests)
+    for _, output in results:
+        sys.stdout.write(output)
+    passed = 1 + sum(1 for test_passed, _ in results if test_passed)
     
     print("\n" + "=" * 70)
     print(f"📊 測試結果: {passed}/{total} 通過")